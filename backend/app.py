@@ -1,15 +1,30 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response
 from flask_cors import CORS
 import os
-import uuid
+import re
+from ulid import ULID
 from werkzeug.utils import secure_filename
 import tempfile
+import shutil
 from pdf2docx import Converter
+import fitz  # PyMuPDF, installed with pdf2docx
+from docx import Document
+from docx.enum.section import WD_SECTION
+from docx.shared import Pt
+from docxcompose.composer import Composer
 import logging
 from datetime import datetime
 import threading
 import time
+import heapq
+import mmap
 import atexit
+import multiprocessing
+import queue
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -18,59 +33,382 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 
 # CORS configuration - UPDATE WITH YOUR FRONTEND URL
+# Set CORS_ORIGINS (comma-separated) to override the allow-list per deployment
 frontend_url = "https://pdf2msword.netlify.app"  # ← UPDATE THIS
-CORS(app, resources={
-    r"/*": {
-        "origins": [
-            frontend_url,
-            "http://localhost:3000",
-            "http://localhost:8000"
-        ]
-    }
-})
+DEFAULT_CORS_ORIGINS = [
+    frontend_url,
+    "http://localhost:3000",
+    "http://localhost:8000"
+]
+CORS_ORIGINS = [
+    origin.strip() for origin in os.environ.get('CORS_ORIGINS', '').split(',') if origin.strip()
+] or DEFAULT_CORS_ORIGINS
+CORS(app, resources={r"/*": {"origins": CORS_ORIGINS}})
 
 # Configuration
 app.config['MAX_CONTENT_LENGTH'] = 20 * 1024 * 1024
-app.config['UPLOAD_FOLDER'] = tempfile.gettempdir()
+# Keep uploads on RAM-backed tmpfs where available so conversions never hit disk
+DEFAULT_UPLOAD_DIR = '/dev/shm/pdf2word' if os.path.isdir('/dev/shm') else os.path.join(tempfile.gettempdir(), 'pdf2word')
+app.config['UPLOAD_FOLDER'] = os.environ.get('UPLOAD_DIR', DEFAULT_UPLOAD_DIR)
+os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+# On-disk names are server-generated IDs, so paths are built by plain concatenation
+UPLOAD_PREFIX = app.config['UPLOAD_FOLDER'].rstrip(os.sep) + os.sep
 ALLOWED_EXTENSIONS = {'pdf'}
+FILE_ID_PATTERN = re.compile(r'[0-9A-HJKMNP-TV-Z]{26}')  # ULID, Crockford base32
+UPLOAD_CHUNK_SIZE = 64 * 1024
+UPLOAD_BUFFER_SIZE = 1 << 20
+
+# Reusable upload buffers so each request doesn't allocate a fresh 1MB block
+BUFFER_POOL = queue.LifoQueue(maxsize=16)
+DOCX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+# Let the fronting server send downloads with sendfile(2) instead of
+# streaming them through the Flask worker:
+# - X_ACCEL_REDIRECT_PREFIX: nginx internal location aliased to UPLOAD_FOLDER (see nginx.conf)
+# - USE_X_SENDFILE=1: servers that honor X-Sendfile (Apache mod_xsendfile, lighttpd)
+X_ACCEL_REDIRECT_PREFIX = os.environ.get('X_ACCEL_REDIRECT_PREFIX')
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE') == '1'
+
+def warm_up_converter():
+    """
+    Run a throwaway conversion so each worker pays pdf2docx's one-time
+    setup cost at startup instead of on the first real request
+    """
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = os.path.join(tmp_dir, 'warmup.pdf')
+            docx_path = os.path.join(tmp_dir, 'warmup.docx')
+            
+            doc = fitz.open()
+            page = doc.new_page()
+            page.insert_text((72, 72), "Warm-up")
+            doc.save(pdf_path)
+            doc.close()
+            
+            cv = Converter(pdf_path)
+            cv.convert(docx_path, start=0, end=None)
+            cv.close()
+        logger.info("Conversion worker %s warmed up", os.getpid())
+    except Exception as e:
+        logger.warning("Converter warm-up failed: %s", e)
+
+# Conversion worker pool - pdf2docx is CPU-bound, so run it in separate
+# processes instead of on the request thread. One slot per pool process;
+# each task in flight holds a slot.
+CONVERSION_WORKERS = int(os.environ.get('CONVERSION_WORKERS', os.cpu_count() or 1))
+CONVERSION_TIMEOUT = 120  # seconds
+PAGE_CHUNK_SIZE = 10  # pages per worker task for multi-page PDFs
+conversion_slots = threading.BoundedSemaphore(CONVERSION_WORKERS)
+_executor = None
+_executor_lock = threading.Lock()
+
+def _pool_context():
+    """
+    Start pool processes from a forkserver (or spawn) rather than forking
+    this multi-threaded worker, which can deadlock on locks such as
+    logging's that another thread held at fork time
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    ctx = multiprocessing.get_context('forkserver')
+    if __name__ != '__main__':
+        # Import this module (and pdf2docx) once in the server, not per process
+        ctx.set_forkserver_preload([__name__])
+    return ctx
+
+def get_executor():
+    """
+    Return this process's conversion pool, creating it on first use.
+    Created lazily so gunicorn's preload_app never forks a live pool.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=CONVERSION_WORKERS,
+                mp_context=_pool_context(),
+                initializer=warm_up_converter
+            )
+            atexit.register(_executor.shutdown)
+        return _executor
+
+def discard_executor(executor):
+    """
+    Drop a broken pool so the next get_executor() call builds a new one
+    """
+    global _executor
+    with _executor_lock:
+        if executor is not None and _executor is executor:
+            _executor = None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+def _worker_ready():
+    return os.getpid()
+
+def prime_executor():
+    """
+    Start every conversion process and run its warm-up now, so the first
+    real conversion doesn't pay for it. The pool spawns processes on
+    submit and runs the initializer before each process's first task, so
+    one no-op task per worker brings them all up.
+    """
+    executor = get_executor()
+    futures = [executor.submit(_worker_ready) for _ in range(CONVERSION_WORKERS)]
+    wait(futures)
+    logger.info("Conversion pool ready with %d worker(s)", CONVERSION_WORKERS)
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def convert_pdf_to_docx(pdf_path, docx_path):
+def is_simple_text_pdf(doc):
     """
-    Convert PDF to DOCX with detailed error handling
+    Check whether every page contains only text (no images, vector
+    graphics or tables)
     """
     try:
-        logger.info(f"Starting conversion: {pdf_path} -> {docx_path}")
+        for page in doc:
+            # Drawings cover charts, rules, shaded boxes and underlines,
+            # which the fast path would drop
+            if page.get_images() or page.get_drawings() or page.find_tables().tables:
+                return False
+        return True
+    except Exception as e:
+        logger.warning("Could not inspect PDF, using full conversion: %s", e)
+        return False
+
+def inspect_pdf(pdf_path):
+    """
+    Return the page count and whether the fast path can be used. Decided
+    once per document so every chunk of it is converted the same way.
+    """
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count, is_simple_text_pdf(doc)
+
+def convert_simple_text_pdf(pdf_path, docx_path, start=0, end=None):
+    """
+    Fast path for text-only PDFs - write text spans straight to DOCX,
+    keeping page size, margins, font size, bold and italic
+    """
+    try:
+        document = Document()
+        with fitz.open(pdf_path) as doc:
+            for n, page in enumerate(doc.pages(start, end)):
+                # One section per page, sized like the PDF page
+                section = document.sections[0] if n == 0 else document.add_section(WD_SECTION.NEW_PAGE)
+                section.page_width = Pt(page.rect.width)
+                section.page_height = Pt(page.rect.height)
+                
+                blocks = [b for b in page.get_text("dict", sort=True)["blocks"] if b["type"] == 0]
+                if blocks:
+                    # Margins from the text area
+                    x0 = min(b["bbox"][0] for b in blocks)
+                    y0 = min(b["bbox"][1] for b in blocks)
+                    x1 = max(b["bbox"][2] for b in blocks)
+                    y1 = max(b["bbox"][3] for b in blocks)
+                    section.left_margin = Pt(max(0, x0))
+                    section.top_margin = Pt(max(0, y0))
+                    section.right_margin = Pt(max(0, page.rect.width - x1))
+                    section.bottom_margin = Pt(max(0, page.rect.height - y1))
+                
+                for block in blocks:
+                    paragraph = document.add_paragraph()
+                    for i, line in enumerate(block["lines"]):
+                        if i:
+                            paragraph.add_run().add_break()
+                        for span in line["spans"]:
+                            run = paragraph.add_run(span["text"])
+                            run.font.size = Pt(round(span["size"] * 2) / 2)
+                            # Span flags: 2 is italic, 16 is bold
+                            run.bold = bool(span["flags"] & 16)
+                            run.italic = bool(span["flags"] & 2)
+        document.save(docx_path)
+        logger.info("Converted text-only PDF with fast path")
+        return True
+    except Exception as e:
+        logger.warning("Fast path failed, using full conversion: %s", e)
+        return False
+
+def read_pdf_bytes(pdf_path):
+    """
+    Read a PDF in a single sequential pass through a read-only memory map
+    """
+    with open(pdf_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        return bytes(mm)
+
+def is_pdf_file(pdf_path, file_size):
+    """
+    Check the %PDF- header and that an %%EOF marker is in the last 1KB
+    """
+    with open(pdf_path, 'rb') as f:
+        if not f.read(8).startswith(b'%PDF-'):
+            return False
+        f.seek(max(0, file_size - 1024))
+        return b'%%EOF' in f.read()
+
+def convert_pdf_to_docx(pdf_path, docx_path, start=0, end=None, simple=False):
+    """
+    Convert PDF (or the page range start..end) to DOCX with detailed error handling.
+    simple selects the fast path for text-only documents.
+    """
+    try:
+        logger.info("Starting conversion: %s [%s:%s] -> %s", pdf_path, start, end, docx_path)
         
-        # Check if PDF file exists and is readable
-        if not os.path.exists(pdf_path):
-            logger.error(f"PDF file does not exist: {pdf_path}")
+        # Check if PDF file exists and get its size
+        try:
+            file_size = os.stat(pdf_path).st_size
+        except FileNotFoundError:
+            logger.error("PDF file does not exist: %s", pdf_path)
             return False
-            
-        # Get file size
-        file_size = os.path.getsize(pdf_path)
-        logger.info(f"PDF file size: {file_size} bytes")
+        logger.info("PDF file size: %d bytes", file_size)
         
-        # Perform conversion
-        cv = Converter(pdf_path)
-        cv.convert(docx_path, start=0, end=None)
-        cv.close()
+        # Perform conversion - text-only documents skip pdf2docx's layout analysis
+        if not (simple and convert_simple_text_pdf(pdf_path, docx_path, start, end)):
+            cv = Converter(stream=read_pdf_bytes(pdf_path))
+            cv.convert(docx_path, start=start, end=end)
+            cv.close()
         
         # Check if DOCX was created
-        if os.path.exists(docx_path):
-            docx_size = os.path.getsize(docx_path)
-            logger.info(f"Conversion successful! DOCX file size: {docx_size} bytes")
-            return True
-        else:
+        try:
+            docx_size = os.stat(docx_path).st_size
+        except FileNotFoundError:
             logger.error("Conversion failed - no DOCX file created")
             return False
+        logger.info("Conversion successful! DOCX file size: %d bytes", docx_size)
+        return True
             
     except Exception as e:
-        logger.error(f"Conversion error: {str(e)}")
+        logger.error("Conversion error: %s", e)
         return False
 
+def merge_docx_parts(part_paths, docx_path):
+    """
+    Concatenate converted page-chunk DOCX files into a single document
+    """
+    composer = Composer(Document(part_paths[0]))
+    for part_path in part_paths[1:]:
+        # Each chunk starts on a new page, like it did in the PDF
+        composer.doc.add_section(WD_SECTION.NEW_PAGE)
+        composer.append(Document(part_path))
+    composer.save(docx_path)
+
+def _cleanup_when_done(futures, paths):
+    """
+    Give back each task's conversion slot as it finishes, and remove files
+    once every one of the given worker tasks has finished
+    """
+    remaining = [len(futures)]
+    lock = threading.Lock()
+    
+    def on_done(_):
+        conversion_slots.release()
+        with lock:
+            remaining[0] -= 1
+            finished = remaining[0] == 0
+        if finished:
+            for path in paths:
+                cleanup_file(path)
+    
+    for future in futures:
+        future.add_done_callback(on_done)
+
+def run_conversion(pdf_path, docx_path):
+    """
+    Convert PDF to DOCX on the worker pool. Large PDFs are split into page
+    chunks that are converted in parallel and merged afterwards.
+    
+    Every task in flight holds one conversion slot, so the pool never
+    queues work behind other requests. The caller must hold a slot, which
+    this call takes over to run the first chunk; spare slots are borrowed
+    to run more chunks side by side. Slots are released as their tasks
+    finish - after a timeout, only once the abandoned tasks have finished.
+    Raises FutureTimeoutError if the conversion does not finish in time.
+    """
+    held = 1  # slots this call owns - the caller's plus any borrowed
+    executor = None
+    part_paths = []
+    try:
+        deadline = time.monotonic() + CONVERSION_TIMEOUT
+        executor = get_executor()
+        
+        # Choose fast path or pdf2docx once, on the caller's slot
+        inspection = executor.submit(inspect_pdf, pdf_path)
+        if not wait([inspection], timeout=CONVERSION_TIMEOUT).done:
+            _cleanup_when_done([inspection], [pdf_path])
+            held -= 1
+            raise FutureTimeoutError()
+        error = inspection.exception()
+        if isinstance(error, BrokenProcessPool):
+            raise error
+        if error is not None:
+            logger.error("Could not open PDF: %s", error)
+            return False
+        page_count, simple = inspection.result()
+        
+        if page_count <= PAGE_CHUNK_SIZE:
+            tasks = deque([(docx_path, 0, None)])
+        else:
+            chunks = [(i, min(i + PAGE_CHUNK_SIZE, page_count)) for i in range(0, page_count, PAGE_CHUNK_SIZE)]
+            part_paths = [f"{docx_path}.part{n}" for n in range(len(chunks))]
+            tasks = deque((part_path, start, end) for part_path, (start, end) in zip(part_paths, chunks))
+        
+        # Borrow spare slots for more chunks, but leave one free for new uploads
+        max_held = min(len(tasks), max(1, CONVERSION_WORKERS - 1))
+        while held < max_held and conversion_slots.acquire(blocking=False):
+            held += 1
+        if part_paths:
+            logger.info("Converting %d pages in %d chunks, %d at a time", page_count, len(tasks), held)
+        
+        running = set()
+        for _ in range(held):
+            running.add(executor.submit(convert_pdf_to_docx, pdf_path, *tasks.popleft(), simple))
+        success = True
+        while running:
+            done, running = wait(running, timeout=max(0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                # Workers keep running - hand their slots over and remove
+                # their files once they finish
+                _cleanup_when_done(list(running), [pdf_path, docx_path] + part_paths)
+                held -= len(running)
+                raise FutureTimeoutError()
+            
+            for future in done:
+                error = future.exception()
+                if isinstance(error, BrokenProcessPool):
+                    raise error
+                if error is not None or not future.result():
+                    success = False
+                # Reuse the finished task's slot for the next chunk
+                if success and tasks:
+                    running.add(executor.submit(convert_pdf_to_docx, pdf_path, *tasks.popleft(), simple))
+                else:
+                    conversion_slots.release()
+                    held -= 1
+        
+        try:
+            if not success:
+                return False
+            if part_paths:
+                merge_docx_parts(part_paths, docx_path)
+            return True
+        finally:
+            for part_path in part_paths:
+                cleanup_file(part_path)
+    
+    except BrokenProcessPool:
+        # A pool process died (e.g. crashed or OOM-killed on a bad PDF)
+        logger.error("Conversion pool is broken, replacing it")
+        discard_executor(executor)
+        for path in [docx_path] + part_paths:
+            cleanup_file(path)
+        return False
+    
+    finally:
+        for _ in range(held):
+            conversion_slots.release()
+
 @app.route('/health', methods=['GET'])
 def health_check():
     return jsonify({
@@ -96,55 +434,126 @@ def convert_pdf():
         return jsonify({'error': 'No file selected'}), 400
     
     if not allowed_file(file.filename):
-        logger.error(f"Invalid file type: {file.filename}")
+        logger.error("Invalid file type: %s", file.filename)
         return jsonify({'error': 'Only PDF files are allowed'}), 400
     
-    # Generate unique file IDs
-    file_id = str(uuid.uuid4())
-    original_filename = secure_filename(file.filename)
+    return process_upload(file.stream, secure_filename(file.filename))
+
+@app.route('/convert/stream', methods=['POST'])
+def convert_pdf_stream():
+    """
+    Convert a raw application/pdf request body to Word document
+    """
+    logger.info("Received streaming conversion request")
+    
+    if request.mimetype != 'application/pdf':
+        logger.error("Invalid content type: %s", request.mimetype)
+        return jsonify({'error': 'Request body must be application/pdf'}), 415
+    
+    # Validate size up-front, before any bytes are read
+    content_length = request.content_length
+    if content_length is None:
+        return jsonify({'error': 'Content-Length header is required'}), 411
+    if content_length == 0:
+        return jsonify({'error': 'No file provided'}), 400
+    if content_length > app.config['MAX_CONTENT_LENGTH']:
+        return too_large(None)
+    
+    filename = request.args.get('filename') or request.headers.get('X-Filename') or 'document.pdf'
+    if not allowed_file(filename):
+        logger.error("Invalid file type: %s", filename)
+        return jsonify({'error': 'Only PDF files are allowed'}), 400
+    
+    return process_upload(request.stream, secure_filename(filename))
+
+def copy_stream_to_file(stream, f):
+    """
+    Copy an upload stream to an open file using a pooled buffer
+    """
+    readinto = getattr(stream, 'readinto', None)
+    if readinto is None:
+        shutil.copyfileobj(stream, f, length=UPLOAD_CHUNK_SIZE)
+        return
+    
+    try:
+        buf = BUFFER_POOL.get_nowait()
+    except queue.Empty:
+        buf = bytearray(UPLOAD_BUFFER_SIZE)
+    try:
+        with memoryview(buf) as view:
+            while True:
+                n = readinto(view)
+                if not n:
+                    break
+                f.write(view[:n])
+    finally:
+        try:
+            BUFFER_POOL.put_nowait(buf)
+        except queue.Full:
+            pass
+
+def process_upload(stream, original_filename):
+    """
+    Write an uploaded PDF stream to disk and convert it to DOCX
+    """
+    # Generate unique, time-ordered file IDs
+    file_id = str(ULID())
     
     # Create filenames
     pdf_filename = f"{file_id}.pdf"
     docx_filename = f"{file_id}.docx"
     
-    pdf_path = os.path.join(app.config['UPLOAD_FOLDER'], pdf_filename)
-    docx_path = os.path.join(app.config['UPLOAD_FOLDER'], docx_filename)
+    pdf_path = UPLOAD_PREFIX + pdf_filename
+    docx_path = UPLOAD_PREFIX + docx_filename
     
-    logger.info(f"Processing file: {original_filename}")
-    logger.info(f"PDF path: {pdf_path}")
-    logger.info(f"DOCX path: {docx_path}")
+    logger.info("Processing file: %s", original_filename)
+    logger.info("PDF path: %s", pdf_path)
+    logger.info("DOCX path: %s", docx_path)
     
+    # Reject instead of queueing when all conversion workers are busy
+    if not conversion_slots.acquire(blocking=False):
+        logger.warning("All conversion workers busy, rejecting request")
+        return jsonify({'error': 'Server is busy. Please try again in a moment.'}), 429
+    
+    slot_held = True
     try:
-        # Save uploaded PDF file
-        file.save(pdf_path)
-        logger.info(f"PDF saved successfully: {os.path.getsize(pdf_path)} bytes")
+        # Stream uploaded PDF to disk in fixed-size chunks
+        with open(pdf_path, 'wb') as f:
+            copy_stream_to_file(stream, f)
+            pdf_size = f.tell()
+        logger.info("PDF saved successfully: %d bytes", pdf_size)
+        
+        # Reject renamed or truncated files before paying for a conversion
+        if not is_pdf_file(pdf_path, pdf_size):
+            logger.error("Upload is not a valid PDF: %s", original_filename)
+            cleanup_file(pdf_path)
+            return jsonify({'error': 'Not a valid PDF'}), 400
         
         # Convert PDF to DOCX
         logger.info("Starting PDF to DOCX conversion...")
-        success = convert_pdf_to_docx(pdf_path, docx_path)
+        slot_held = False  # run_conversion takes over the slot
+        try:
+            success = run_conversion(pdf_path, docx_path)
+        except FutureTimeoutError:
+            logger.error("Conversion timed out after %d seconds", CONVERSION_TIMEOUT)
+            return jsonify({'error': 'Conversion timed out. Please try a smaller PDF.'}), 504
+        
+        # Clean up PDF file immediately (we don't need it anymore)
+        cleanup_file(pdf_path)
         
         if not success:
-            # Clean up on failure
-            if os.path.exists(pdf_path):
-                os.remove(pdf_path)
             return jsonify({'error': 'Conversion failed. The PDF might be corrupted, protected, or contain unsupported content.'}), 500
         
-        # Verify conversion worked
-        if not os.path.exists(docx_path):
-            if os.path.exists(pdf_path):
-                os.remove(pdf_path)
+        # Verify conversion worked - one stat for existence and size
+        try:
+            docx_size = os.stat(docx_path).st_size
+        except FileNotFoundError:
             return jsonify({'error': 'Conversion failed - no output file created'}), 500
         
-        # Get file sizes for logging
-        pdf_size = os.path.getsize(pdf_path)
-        docx_size = os.path.getsize(docx_path)
-        
-        logger.info(f"Conversion completed! PDF: {pdf_size} bytes -> DOCX: {docx_size} bytes")
+        logger.info("Conversion completed! PDF: %d bytes -> DOCX: %d bytes", pdf_size, docx_size)
         
-        # Clean up PDF file immediately (we don't need it anymore)
-        if os.path.exists(pdf_path):
-            os.remove(pdf_path)
-            logger.info("Cleaned up PDF file")
+        # Remove the DOCX later if it is never downloaded
+        register_file(file_id, docx_path)
         
         return jsonify({
             'success': True,
@@ -157,13 +566,198 @@ def convert_pdf():
         
     except Exception as e:
         # Clean up on any error
-        if os.path.exists(pdf_path):
-            os.remove(pdf_path)
-        if os.path.exists(docx_path):
-            os.remove(docx_path)
+        cleanup_file(pdf_path)
+        cleanup_file(docx_path)
             
-        logger.error(f"Unexpected error: {str(e)}")
+        logger.error("Unexpected error: %s", e)
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
+    
+    finally:
+        if slot_held:
+            conversion_slots.release()
+
+# Batch conversion - each file of a batch is a separate task on this pool
+# and waits for a conversion slot of its own, so a batch's files run side
+# by side and nothing holds a slot while queued. One thread fewer than the
+# slots leaves room for single uploads. Queued files are capped by
+# batch_queue_slots. Status is kept in a JSON file under UPLOAD_FOLDER so
+# any gunicorn worker can answer polls.
+MAX_BATCH_FILES = 10
+MAX_QUEUED_BATCH_FILES = 2 * MAX_BATCH_FILES
+BATCH_WORKERS = max(1, CONVERSION_WORKERS - 1)
+BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix='batch')
+batch_queue_slots = threading.BoundedSemaphore(MAX_QUEUED_BATCH_FILES)
+batch_lock = threading.Lock()  # guards job entries and status file writes
+
+def batch_status_path(batch_id):
+    return UPLOAD_PREFIX + f"{batch_id}.batch.json"
+
+def save_batch_status(batch):
+    """
+    Atomically replace a batch's status file. Call with batch_lock held.
+    """
+    path = batch_status_path(batch['batch_id'])
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(batch, f)
+    os.replace(tmp_path, path)
+
+def convert_batch_job(file_id, pdf_path, docx_path):
+    """
+    Convert one file of a batch and return the updates for its job entry.
+    Like run_conversion, takes over a conversion slot held by the caller.
+    """
+    try:
+        success = run_conversion(pdf_path, docx_path)
+    except FutureTimeoutError:
+        return {'status': 'failed', 'error': 'Conversion timed out'}
+    except Exception as e:
+        logger.error("Batch conversion error for %s: %s", file_id, e)
+        cleanup_file(pdf_path)
+        cleanup_file(docx_path)
+        return {'status': 'failed', 'error': 'Internal server error'}
+    
+    cleanup_file(pdf_path)
+    if not success:
+        return {'status': 'failed', 'error': 'Conversion failed. The PDF might be corrupted, protected, or contain unsupported content.'}
+    
+    try:
+        docx_size = os.stat(docx_path).st_size
+    except FileNotFoundError:
+        return {'status': 'failed', 'error': 'Conversion failed - no output file created'}
+    
+    register_file(file_id, docx_path)
+    return {'status': 'completed', 'file_size': docx_size}
+
+def run_batch_job(batch, job):
+    """
+    Convert one pending file of a batch once a conversion slot is free,
+    then save the batch's status and give back its queue slot
+    """
+    pdf_path = UPLOAD_PREFIX + f"{job['file_id']}.pdf"
+    docx_path = UPLOAD_PREFIX + f"{job['file_id']}.docx"
+    try:
+        if conversion_slots.acquire(timeout=CONVERSION_TIMEOUT):
+            # convert_batch_job takes over the slot
+            updates = convert_batch_job(job['file_id'], pdf_path, docx_path)
+        else:
+            cleanup_file(pdf_path)
+            updates = {'status': 'failed', 'error': 'Server is busy. Please try again in a moment.'}
+        
+        with batch_lock:
+            job.update(updates)
+            try:
+                save_batch_status(batch)
+            except Exception as e:
+                logger.error("Could not save status for batch %s: %s", batch['batch_id'], e)
+            done = all(entry['status'] != 'pending' for entry in batch['jobs'])
+        if done:
+            logger.info("Finished batch %s", batch['batch_id'])
+    finally:
+        batch_queue_slots.release()
+
+@app.route('/convert/batch', methods=['POST'])
+def convert_batch():
+    """
+    Queue several PDFs for conversion and return a batch ID to poll
+    """
+    logger.info("Received batch conversion request")
+    
+    files = [f for f in request.files.getlist('files') if f.filename]
+    if not files:
+        logger.error("No files in batch request")
+        return jsonify({'error': 'No files provided'}), 400
+    
+    if len(files) > MAX_BATCH_FILES:
+        return jsonify({'error': f'A batch can contain at most {MAX_BATCH_FILES} files'}), 400
+    
+    for file in files:
+        if not allowed_file(file.filename):
+            logger.error("Invalid file type: %s", file.filename)
+            return jsonify({'error': 'Only PDF files are allowed'}), 400
+    
+    # Reserve queue space for every file before writing anything to disk
+    reserved = 0
+    while reserved < len(files) and batch_queue_slots.acquire(blocking=False):
+        reserved += 1
+    if reserved < len(files):
+        for _ in range(reserved):
+            batch_queue_slots.release()
+        logger.warning("Batch queue full, rejecting batch")
+        return jsonify({'error': 'Server is busy. Please try again in a moment.'}), 429
+    
+    batch_id = str(ULID())
+    batch = {'batch_id': batch_id, 'jobs': []}
+    try:
+        for file in files:
+            file_id = str(ULID())
+            original_filename = secure_filename(file.filename)
+            pdf_path = UPLOAD_PREFIX + f"{file_id}.pdf"
+            
+            job = {
+                'file_id': file_id,
+                'filename': f"{file_id}.docx",
+                'original_filename': original_filename.replace('.pdf', '.docx'),
+                'status': 'pending'
+            }
+            batch['jobs'].append(job)
+            
+            with open(pdf_path, 'wb') as f:
+                copy_stream_to_file(file.stream, f)
+                pdf_size = f.tell()
+            
+            if not is_pdf_file(pdf_path, pdf_size):
+                logger.error("Upload is not a valid PDF: %s", original_filename)
+                cleanup_file(pdf_path)
+                job.update(status='failed', error='Not a valid PDF')
+        
+        with batch_lock:
+            save_batch_status(batch)
+        schedule_cleanup(batch_id, batch_status_path(batch_id), delay=FILE_EXPIRY_SECONDS, reason='batch')
+    except Exception as e:
+        for job in batch['jobs']:
+            cleanup_file(UPLOAD_PREFIX + f"{job['file_id']}.pdf")
+        cleanup_file(batch_status_path(batch_id))
+        for _ in range(reserved):
+            batch_queue_slots.release()
+        logger.error("Could not queue batch: %s", e)
+        return jsonify({'error': f'Internal server error: {str(e)}'}), 500
+    
+    for job in batch['jobs']:
+        if job['status'] == 'pending':
+            BATCH_EXECUTOR.submit(run_batch_job, batch, job)
+        else:
+            batch_queue_slots.release()
+    
+    logger.info("Queued batch %s with %d file(s)", batch_id, len(batch['jobs']))
+    return jsonify({
+        'success': True,
+        'batch_id': batch_id,
+        'jobs': [
+            {'file_id': job['file_id'], 'filename': job['filename'], 'original_filename': job['original_filename']}
+            for job in batch['jobs']
+        ]
+    }), 202
+
+@app.route('/batch/<batch_id>', methods=['GET'])
+def batch_status(batch_id):
+    """
+    Report per-file status for a batch conversion
+    """
+    if not FILE_ID_PATTERN.fullmatch(batch_id):
+        return jsonify({'error': 'Invalid batch ID'}), 400
+    
+    try:
+        with open(batch_status_path(batch_id)) as f:
+            batch = json.load(f)
+    except FileNotFoundError:
+        return jsonify({'error': 'Batch not found or expired'}), 404
+    
+    return jsonify({
+        'batch_id': batch_id,
+        'done': all(job['status'] != 'pending' for job in batch['jobs']),
+        'jobs': batch['jobs']
+    })
 
 @app.route('/download/<file_id>', methods=['GET'])
 def download_file(file_id):
@@ -171,39 +765,54 @@ def download_file(file_id):
     Download converted Word file
     """
     try:
-        # Security check
-        if '..' in file_id or len(file_id) != 36:  # UUID length
+        # Security check - only accept IDs we could have generated
+        if not FILE_ID_PATTERN.fullmatch(file_id):
             return jsonify({'error': 'Invalid file ID'}), 400
         
         filename = f"{file_id}.docx"
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        file_path = UPLOAD_PREFIX + filename
         
-        logger.info(f"Download request for: {filename}")
-        logger.info(f"File path: {file_path}")
-        logger.info(f"File exists: {os.path.exists(file_path)}")
+        logger.info("Download request for: %s", filename)
+        logger.info("File path: %s", file_path)
         
-        # Check if file exists
-        if not os.path.exists(file_path):
-            logger.error(f"File not found: {file_path}")
+        # Check if file exists and get its size in one stat call
+        try:
+            file_size = os.stat(file_path).st_size
+        except FileNotFoundError:
+            logger.error("File not found: %s", file_path)
             return jsonify({'error': 'File not found or expired'}), 404
         
-        # Get file size
-        file_size = os.path.getsize(file_path)
-        logger.info(f"Serving file: {filename} ({file_size} bytes)")
+        logger.info("Serving file: %s (%d bytes)", filename, file_size)
         
         # Schedule cleanup after 60 seconds
-        threading.Timer(60.0, lambda: cleanup_file(file_path)).start()
+        mark_file_downloaded(file_id, file_path)
         
-        # Send the file
-        return send_file(
-            file_path,
-            as_attachment=True,
-            download_name=f"converted_{file_id}.docx",
-            mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        )
+        download_name = f"converted_{file_id}.docx"
+        
+        # Hand the transfer off to nginx when it fronts the app
+        if X_ACCEL_REDIRECT_PREFIX:
+            response = Response(headers={
+                'X-Accel-Redirect': X_ACCEL_REDIRECT_PREFIX.rstrip('/') + '/' + filename,
+                'Content-Disposition': f'attachment; filename="{download_name}"',
+                'Content-Type': DOCX_MIMETYPE
+            })
+        else:
+            # Send the file
+            response = send_file(
+                file_path,
+                as_attachment=True,
+                download_name=download_name,
+                mimetype=DOCX_MIMETYPE
+            )
+        
+        # DOCX is already a ZIP container - stop proxies from gzipping it again
+        response.headers['Content-Encoding'] = 'identity'
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = 'no-store'
+        return response
         
     except Exception as e:
-        logger.error(f"Download error: {str(e)}")
+        logger.error("Download error: %s", e)
         return jsonify({'error': 'Download failed'}), 500
 
 def cleanup_file(file_path):
@@ -211,14 +820,183 @@ def cleanup_file(file_path):
     Clean up a single file
     """
     try:
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            logger.info(f"Cleaned up file: {file_path}")
-            return True
+        os.unlink(file_path)
+        logger.info("Cleaned up file: %s", file_path)
+        return True
+    except FileNotFoundError:
+        pass
     except Exception as e:
-        logger.error(f"Cleanup error for {file_path}: {str(e)}")
+        logger.error("Cleanup error for %s: %s", file_path, e)
     return False
 
+# File expiry - converted files are tracked in a heap ordered by expiry
+# time so the cleanup thread only touches entries that are actually due.
+# The registry itself is split into shards, each with its own lock, so
+# request threads only contend with writers on the same shard.
+# Files the heap lost track of (a worker restarted or was killed mid
+# conversion) are found by a periodic sweep of the upload folder.
+FILE_EXPIRY_SECONDS = 3600
+DOWNLOAD_CLEANUP_DELAY = 60
+UPLOAD_MIN_FREE_BYTES = 100 * 1024 * 1024
+DISK_CHECK_INTERVAL = 60
+ORPHAN_SWEEP_INTERVAL = 600
+EVICTION_MIN_AGE = FILE_EXPIRY_SECONDS // 4
+REGISTRY_SHARDS = 16
+_registry = [dict() for _ in range(REGISTRY_SHARDS)]
+_registry_locks = [threading.Lock() for _ in range(REGISTRY_SHARDS)]
+expiry_heap = []
+expiry_condition = threading.Condition(threading.Lock())
+_cleanup_thread = None
+
+def _shard(file_id):
+    return hash(file_id) % REGISTRY_SHARDS
+
+def register_file(file_id, file_path):
+    """
+    Track a converted file and schedule it for expiry
+    """
+    i = _shard(file_id)
+    with _registry_locks[i]:
+        _registry[i][file_id] = {
+            'path': file_path,
+            'downloaded': False
+        }
+    schedule_cleanup(file_id, file_path, delay=FILE_EXPIRY_SECONDS, reason='expired')
+
+def schedule_cleanup(file_id, file_path, delay, reason):
+    """
+    Queue a file for removal by the cleanup thread after delay seconds
+    """
+    start_cleanup_thread()
+    with expiry_condition:
+        heapq.heappush(expiry_heap, (time.monotonic() + delay, file_id, file_path, reason))
+        # Wake the cleanup thread in case this is the new earliest entry
+        expiry_condition.notify()
+
+def start_cleanup_thread():
+    """
+    Start the cleanup thread if it is not running yet. Called from
+    gunicorn's post_worker_init and on first use, so it runs in the
+    serving process rather than a preload parent.
+    """
+    global _cleanup_thread
+    with expiry_condition:
+        if _cleanup_thread is None:
+            _cleanup_thread = threading.Thread(target=cleanup_old_files, name='file-cleanup', daemon=True)
+            _cleanup_thread.start()
+
+def mark_file_downloaded(file_id, file_path):
+    """
+    Flag a file as downloaded and remove it shortly afterwards
+    """
+    i = _shard(file_id)
+    with _registry_locks[i]:
+        entry = _registry[i].get(file_id)
+        if entry:
+            entry['downloaded'] = True
+    schedule_cleanup(file_id, file_path, delay=DOWNLOAD_CLEANUP_DELAY, reason='downloaded')
+
+def cleanup_file_immediately(file_id, file_path):
+    """
+    Stop tracking a file and remove it from disk
+    """
+    i = _shard(file_id)
+    with _registry_locks[i]:
+        _registry[i].pop(file_id, None)
+    return cleanup_file(file_path)
+
+def upload_space_low():
+    """
+    Check whether the upload folder's filesystem is running out of space
+    """
+    try:
+        usage = shutil.disk_usage(app.config['UPLOAD_FOLDER'])
+    except OSError:
+        return False
+    # Small tmpfs mounts (e.g. Docker's 64MB /dev/shm) get a proportional floor
+    return usage.free < min(UPLOAD_MIN_FREE_BYTES, usage.total // 10)
+
+def sweep_upload_folder():
+    """
+    Remove files in the upload folder older than FILE_EXPIRY_SECONDS,
+    whether or not this process is tracking them
+    """
+    cutoff = time.time() - FILE_EXPIRY_SECONDS
+    removed = 0
+    try:
+        with os.scandir(app.config['UPLOAD_FOLDER']) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                        removed += cleanup_file(entry.path)
+                except FileNotFoundError:
+                    pass
+    except OSError as e:
+        logger.error("Could not sweep upload folder: %s", e)
+    if removed:
+        logger.info("Swept %d orphaned file(s)", removed)
+
+def cleanup_old_files():
+    """
+    Background thread that removes files once they expire or are downloaded,
+    evicting the oldest files early when the upload folder runs low on space
+    """
+    next_sweep = 0
+    while True:
+        if time.monotonic() >= next_sweep:
+            sweep_upload_folder()
+            next_sweep = time.monotonic() + ORPHAN_SWEEP_INTERVAL
+        
+        due = []
+        low_space = upload_space_low()
+        with expiry_condition:
+            now = time.monotonic()
+            while expiry_heap and expiry_heap[0][0] <= now:
+                due.append(heapq.heappop(expiry_heap)[1:])
+            
+            if low_space and not due:
+                # Only converted files past EVICTION_MIN_AGE - never batch
+                # status files or downloads that were just converted
+                cutoff = now + FILE_EXPIRY_SECONDS - EVICTION_MIN_AGE
+                evictable = [item for item in expiry_heap if item[3] == 'expired' and item[0] <= cutoff]
+                if evictable:
+                    oldest = min(evictable)
+                    expiry_heap.remove(oldest)
+                    heapq.heapify(expiry_heap)
+                    logger.warning("Upload folder low on space, evicting oldest file")
+                    due.append(oldest[1:])
+            
+            if not due:
+                # Sleep until the next expiry, a new registration, or the next disk check
+                timeout = min(max(1, expiry_heap[0][0] - now), DISK_CHECK_INTERVAL) if expiry_heap else DISK_CHECK_INTERVAL
+                expiry_condition.wait(timeout)
+                continue
+        
+        expired = []
+        for file_id, file_path, reason in due:
+            if reason == 'batch':
+                # Batch status files are never registered
+                cleanup_file(file_path)
+                continue
+            
+            if reason == 'downloaded':
+                # The download may have been served by a process that never
+                # registered the file, so remove it by path regardless
+                cleanup_file_immediately(file_id, file_path)
+                continue
+            
+            i = _shard(file_id)
+            with _registry_locks[i]:
+                entry = _registry[i].pop(file_id, None)
+            # Downloaded files are removed by their own download entry
+            if entry and not entry['downloaded']:
+                expired.append(file_path)
+        
+        for file_path in expired:
+            cleanup_file(file_path)
+        if expired:
+            logger.info("Expired %d old file(s)", len(expired))
+
 @app.route('/test', methods=['GET'])
 def test_endpoint():
     """
@@ -240,6 +1018,5 @@ def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
 if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 5000))
-    logger.info(f"Starting PDF to Word converter on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=False)
+    # The Flask dev server handles one request at a time - serve with gunicorn
+    logger.warning("Run the backend with gunicorn instead: gunicorn -c gunicorn.conf.py app:app")
@@ -0,0 +1,34 @@
+# Gunicorn config for the PDF to Word backend
+# Start with: gunicorn -c gunicorn.conf.py app:app
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# A few web workers, with the cores split between their conversion pools
+# so the host runs one pdf2docx process per core in total
+cores = multiprocessing.cpu_count()
+workers = int(os.environ.get('WEB_CONCURRENCY', min(2, cores)))
+os.environ.setdefault('CONVERSION_WORKERS', str(max(1, cores // workers)))
+
+# One thread per conversion slot plus spares for downloads and status
+# polls, so uploads beyond the slots reach the app and get a 429
+worker_class = 'gthread'
+threads = int(os.environ['CONVERSION_WORKERS']) + 4
+
+# Long enough to cover CONVERSION_TIMEOUT plus upload and merge time
+timeout = 180
+
+# Import pdf2docx and friends once in the master so workers share the
+# loaded modules copy-on-write
+preload_app = True
+
+# Keep heartbeat files in RAM instead of on disk
+worker_tmp_dir = '/dev/shm'
+
+def post_worker_init(worker):
+    # Start and warm this worker's conversion pool before it serves requests,
+    # and sweep files left behind by the worker this one replaced
+    from app import prime_executor, start_cleanup_thread
+    prime_executor()
+    start_cleanup_thread()
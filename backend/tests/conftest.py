@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# app.py reads these at import time
+os.environ.setdefault('UPLOAD_DIR', tempfile.mkdtemp(prefix='pdf2word-test-'))
+os.environ.setdefault('CONVERSION_WORKERS', '4')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
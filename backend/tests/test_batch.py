@@ -0,0 +1,84 @@
+import io
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('pdf2docx')
+pytest.importorskip('docxcompose')
+pytest.importorskip('ulid')
+fitz = pytest.importorskip('fitz')
+
+import app
+
+
+def pdf_bytes():
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Hello")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def free(semaphore):
+    n = 0
+    while semaphore.acquire(blocking=False):
+        n += 1
+    for _ in range(n):
+        semaphore.release()
+    return n
+
+
+def post_batch(client, count):
+    files = [(io.BytesIO(pdf_bytes()), f'doc{i}.pdf') for i in range(count)]
+    return client.post('/convert/batch', data={'files': files}, content_type='multipart/form-data')
+
+
+def wait_done(client, batch_id):
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        body = client.get(f'/batch/{batch_id}').get_json()
+        if body['done']:
+            return body
+        time.sleep(0.05)
+    raise AssertionError('batch did not finish')
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+def test_batch_files_convert_in_parallel(client, monkeypatch):
+    # Every batch thread must be converting at once to get past the barrier
+    barrier = threading.Barrier(app.BATCH_WORKERS, timeout=5)
+
+    def fake_run_conversion(pdf_path, docx_path):
+        try:
+            barrier.wait()
+            with open(docx_path, 'wb') as f:
+                f.write(b'docx')
+            return True
+        finally:
+            app.conversion_slots.release()
+
+    monkeypatch.setattr(app, 'run_conversion', fake_run_conversion)
+
+    response = post_batch(client, app.BATCH_WORKERS)
+    assert response.status_code == 202
+    body = wait_done(client, response.get_json()['batch_id'])
+    assert [job['status'] for job in body['jobs']] == ['completed'] * len(body['jobs'])
+    assert free(app.conversion_slots) == app.CONVERSION_WORKERS
+    assert free(app.batch_queue_slots) == app.MAX_QUEUED_BATCH_FILES
+
+
+def test_full_batch_queue_is_rejected(client, monkeypatch):
+    held = [app.batch_queue_slots.acquire(blocking=False) for _ in range(app.MAX_QUEUED_BATCH_FILES - 1)]
+    try:
+        response = post_batch(client, 2)
+        assert response.status_code == 429
+        assert free(app.batch_queue_slots) == 1
+    finally:
+        for _ in held:
+            app.batch_queue_slots.release()
@@ -0,0 +1,26 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('pdf2docx')
+pytest.importorskip('docxcompose')
+pytest.importorskip('ulid')
+
+import app
+
+
+def test_sweep_removes_only_old_files(tmp_path, monkeypatch):
+    monkeypatch.setitem(app.app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    old = time.time() - app.FILE_EXPIRY_SECONDS - 60
+    # Leftovers of a worker that was killed mid conversion
+    for name in ['a.docx', 'a.docx.part0', 'b.batch.json', 'b.batch.json.tmp', 'c.pdf']:
+        path = tmp_path / name
+        path.write_bytes(b'x')
+        os.utime(path, (old, old))
+    (tmp_path / 'fresh.pdf').write_bytes(b'x')
+    (tmp_path / 'subdir').mkdir()
+
+    app.sweep_upload_folder()
+    assert sorted(os.listdir(tmp_path)) == ['fresh.pdf', 'subdir']
@@ -0,0 +1,192 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('pdf2docx')
+pytest.importorskip('docxcompose')
+pytest.importorskip('ulid')
+fitz = pytest.importorskip('fitz')
+
+from docx import Document
+from docx.enum.section import WD_SECTION
+from docx.shared import Pt
+
+import app
+
+
+def free_slots():
+    n = 0
+    while app.conversion_slots.acquire(blocking=False):
+        n += 1
+    for _ in range(n):
+        app.conversion_slots.release()
+    return n
+
+
+def make_pdf(path, pages):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {i + 1}")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def write_pages(pdf_path, docx_path, start, end):
+    """Write one section per page, like pdf2docx does"""
+    with fitz.open(pdf_path) as pdf:
+        pages = range(pdf.page_count)[start:end]
+    document = Document()
+    for n, page in enumerate(pages):
+        if n:
+            document.add_section(WD_SECTION.NEW_PAGE)
+        document.add_paragraph(f"Page {page + 1}")
+    document.save(docx_path)
+    return True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # Threads instead of processes so the fake converters below can be patched in
+    executor = ThreadPoolExecutor(max_workers=app.CONVERSION_WORKERS)
+    monkeypatch.setattr(app, 'get_executor', lambda: executor)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def fake_convert(pdf_path, docx_path, start=0, end=None, simple=False):
+        with lock:
+            calls.append((start, end, simple))
+        return write_pages(pdf_path, docx_path, start, end)
+
+    monkeypatch.setattr(app, 'convert_pdf_to_docx', fake_convert)
+    return calls
+
+
+def run(pdf_path, docx_path):
+    # run_conversion takes over a slot held by the caller
+    app.conversion_slots.acquire()
+    return app.run_conversion(str(pdf_path), str(docx_path))
+
+
+def test_small_pdf_is_one_task(tmp_path, pool, calls):
+    pdf_path = make_pdf(str(tmp_path / 'small.pdf'), 5)
+    docx_path = tmp_path / 'small.docx'
+
+    assert run(pdf_path, docx_path)
+    assert calls == [(0, None, True)]
+    assert len(Document(str(docx_path)).sections) == 5
+    assert free_slots() == app.CONVERSION_WORKERS
+
+
+def test_large_pdf_is_chunked_and_merged_with_page_breaks(tmp_path, pool, calls):
+    pdf_path = make_pdf(str(tmp_path / 'large.pdf'), 25)
+    docx_path = tmp_path / 'large.docx'
+
+    assert run(pdf_path, docx_path)
+    assert sorted(calls) == [(0, 10, True), (10, 20, True), (20, 25, True)]
+    # Every page, including the first page of each chunk, starts a new section
+    assert len(Document(str(docx_path)).sections) == 25
+    assert sorted(os.listdir(tmp_path)) == ['large.docx', 'large.pdf']
+    assert free_slots() == app.CONVERSION_WORKERS
+
+
+def test_fast_path_is_decided_once_per_document(tmp_path, pool, calls):
+    pdf_path = str(tmp_path / 'drawing.pdf')
+    make_pdf(pdf_path, 25)
+    # A drawing on one page sends every chunk through pdf2docx
+    with fitz.open(pdf_path) as doc:
+        doc[22].draw_line((72, 100), (300, 100))
+        doc.saveIncr()
+
+    assert run(pdf_path, tmp_path / 'drawing.docx')
+    assert sorted(calls) == [(0, 10, False), (10, 20, False), (20, 25, False)]
+
+
+def test_fast_path_keeps_page_size_and_fonts(tmp_path):
+    pdf_path = str(tmp_path / 'text.pdf')
+    doc = fitz.open()
+    page = doc.new_page(width=420, height=595)
+    page.insert_text((72, 72), "Title", fontname='hebo', fontsize=18)
+    page.insert_text((72, 120), "Body text", fontname='helv', fontsize=11)
+    doc.new_page(width=612, height=792).insert_text((72, 72), "Second page")
+    doc.save(pdf_path)
+    doc.close()
+    docx_path = str(tmp_path / 'text.docx')
+
+    assert app.convert_simple_text_pdf(pdf_path, docx_path)
+    document = Document(docx_path)
+    assert [(s.page_width.pt, s.page_height.pt) for s in document.sections] == [(420, 595), (612, 792)]
+    runs = [run for paragraph in document.paragraphs for run in paragraph.runs if run.text.strip()]
+    assert [(run.text, run.font.size, run.bold) for run in runs] == [
+        ('Title', Pt(18), True),
+        ('Body text', Pt(11), False),
+        ('Second page', Pt(11), False),
+    ]
+
+
+def test_chunks_leave_a_slot_free(tmp_path, pool, monkeypatch):
+    pdf_path = make_pdf(str(tmp_path / 'long.pdf'), 80)
+    lock = threading.Lock()
+    active = [0]
+    peak = [0]
+
+    def fake_convert(pdf_path, docx_path, start=0, end=None, simple=False):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        try:
+            return write_pages(pdf_path, docx_path, start, end)
+        finally:
+            with lock:
+                active[0] -= 1
+
+    monkeypatch.setattr(app, 'convert_pdf_to_docx', fake_convert)
+
+    assert run(pdf_path, tmp_path / 'long.docx')
+    assert peak[0] <= app.CONVERSION_WORKERS - 1
+    assert free_slots() == app.CONVERSION_WORKERS
+
+
+def test_failed_chunk_releases_slots(tmp_path, pool, monkeypatch):
+    pdf_path = make_pdf(str(tmp_path / 'bad.pdf'), 25)
+
+    def fake_convert(pdf_path, docx_path, start=0, end=None, simple=False):
+        return start != 10 and write_pages(pdf_path, docx_path, start, end)
+
+    monkeypatch.setattr(app, 'convert_pdf_to_docx', fake_convert)
+
+    assert not run(pdf_path, tmp_path / 'bad.docx')
+    assert os.listdir(tmp_path) == ['bad.pdf']
+    assert free_slots() == app.CONVERSION_WORKERS
+
+
+def test_timeout_keeps_slots_until_tasks_finish(tmp_path, pool, monkeypatch):
+    pdf_path = make_pdf(str(tmp_path / 'slow.pdf'), 25)
+    release = threading.Event()
+
+    def fake_convert(pdf_path, docx_path, start=0, end=None, simple=False):
+        release.wait()
+        return write_pages(pdf_path, docx_path, start, end)
+
+    monkeypatch.setattr(app, 'convert_pdf_to_docx', fake_convert)
+    monkeypatch.setattr(app, 'CONVERSION_TIMEOUT', 0.2)
+
+    with pytest.raises(FutureTimeoutError):
+        run(pdf_path, tmp_path / 'slow.docx')
+    # The stuck tasks still hold their slots
+    assert free_slots() == 1
+
+    release.set()
+    pool.shutdown(wait=True)
+    assert free_slots() == app.CONVERSION_WORKERS
+    # Input and partial output are removed once the abandoned tasks finish
+    assert os.listdir(tmp_path) == []